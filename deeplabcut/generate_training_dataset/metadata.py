@@ -14,7 +14,9 @@ from __future__ import annotations
 import logging
 import pickle
 import re
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
@@ -73,20 +75,30 @@ class ShuffleMetadata:
                 f"shuffle from metadata.yaml or recreate the metadata.yaml file."
             )
 
-        with open(doc_path, "rb") as f:
-            _, train_idx, test_idx, _ = pickle.load(f)
+        doc_path = Path(doc_path)
         return ShuffleMetadata(
             name=self.name,
             train_fraction=self.train_fraction,
             index=self.index,
             engine=self.engine,
-            split=DataSplit(
-                train_indices=tuple(sorted([int(idx) for idx in train_idx])),
-                test_indices=tuple(sorted([int(idx) for idx in test_idx])),
-            )
+            split=_read_data_split(str(doc_path), doc_path.stat().st_mtime_ns),
         )
 
 
+@lru_cache(maxsize=32)
+def _read_data_split(doc_path: str, mtime_ns: int) -> DataSplit:
+    """Reads the data split stored in a documentation file
+
+    The split is immutable, so it is cached until the file is modified.
+    """
+    with open(doc_path, "rb") as f:
+        _, train_idx, test_idx, _ = pickle.load(f)
+    return DataSplit(
+        train_indices=tuple(sorted([int(idx) for idx in train_idx])),
+        test_indices=tuple(sorted([int(idx) for idx in test_idx])),
+    )
+
+
 @dataclass(frozen=True)
 class TrainingDatasetMetadata:
     """An immutable class containing the metadata for a dataset
@@ -345,6 +357,10 @@ class TrainingDatasetMetadata:
         return Path(cfg["project_path"]) / meta_path
 
 
+# Guards updates to the metadata file, so that concurrent updates aren't lost
+_update_lock = threading.Lock()
+
+
 def update_metadata(
     cfg: dict,
     train_fraction: float,
@@ -371,7 +387,6 @@ def update_metadata(
             index in the metadata file.
     """
     prefix = cfg["Task"] + cfg["date"]
-    metadata = TrainingDatasetMetadata.load(cfg, load_splits=True)
     new_shuffle = ShuffleMetadata(
         name=f"{prefix}-trainset{int(100 * train_fraction)}shuffle{shuffle}",
         train_fraction=train_fraction,
@@ -382,8 +397,11 @@ def update_metadata(
             test_indices=tuple(sorted([int(i) for i in test_indices])),
         )
     )
-    metadata = metadata.add(shuffle=new_shuffle, overwrite=overwrite)
-    metadata.save()
+    # the update is read-modify-write, and shuffles can be created concurrently
+    with _update_lock:
+        metadata = TrainingDatasetMetadata.load(cfg, load_splits=True)
+        metadata = metadata.add(shuffle=new_shuffle, overwrite=overwrite)
+        metadata.save()
 
 
 def get_shuffle_engine(
@@ -26,11 +26,13 @@ from deeplabcut.core.engine import Engine
 from deeplabcut.core.weight_init import WeightInitialization
 from deeplabcut.generate_training_dataset import (
     merge_annotateddatasets,
+    merge_annotateddatasets_cached,
     read_image_shape_fast,
     SplitTrials,
     MakeTrain_pose_yaml,
     MakeTest_pose_yaml,
     MakeInference_yaml,
+    ParseYaml,
     pad_train_test_indices,
     validate_shuffles,
 )
@@ -289,7 +291,7 @@ def create_multianimaltraining_dataset(
         )
 
     # Loading metadata from config file:
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     scorer = cfg["scorer"]
     project_path = cfg["project_path"]
     # Create path for training sets & store data there
@@ -302,7 +304,7 @@ def create_multianimaltraining_dataset(
         trainset_metadata = metadata.TrainingDatasetMetadata.create(cfg)
         trainset_metadata.save()
 
-    Data = merge_annotateddatasets(cfg, full_training_path)
+    Data = merge_annotateddatasets_cached(cfg, full_training_path)
     if Data is None:
         return
     Data = Data[scorer]
@@ -385,6 +387,8 @@ def create_multianimaltraining_dataset(
         model_path = dlcparent_path
     else:
         model_path = auxfun_models.check_for_weights(net_type, Path(dlcparent_path))
+        # parsed once, as a pose config is created from it for each split
+        default_pose_cfg = ParseYaml(defaultconfigfile)[0]
 
     Shuffles = validate_shuffles(cfg, Shuffles, num_shuffles, userfeedback)
 
@@ -564,6 +568,7 @@ def create_multianimaltraining_dataset(
                     path_train_config,
                     defaultconfigfile,
                     save=(engine == Engine.TF),
+                    preparsed=default_pose_cfg,
                 )
                 keys2save = [
                     "dataset",
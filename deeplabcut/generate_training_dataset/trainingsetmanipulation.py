@@ -10,12 +10,20 @@
 #
 from __future__ import annotations
 
+import copy
+import hashlib
+import importlib.util
+import io
 import math
 import logging
 import os
 import os.path
+import re
+import threading
+import uuid
 import warnings
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
 from PIL import Image
@@ -37,6 +45,166 @@ from deeplabcut.utils import (
 )
 from deeplabcut.utils.auxfun_videos import VideoReader
 
+# Use the libyaml bindings when they are available, as they are much faster. The pose
+# configs are dumped with the full (not the safe) dumper, as values such as paths or
+# tuples can end up in them, and with sorted keys to keep the files easy to compare.
+try:
+    from yaml import CSafeLoader as _YamlLoader, CDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, Dumper as _YamlDumper
+
+# The CSV copies of annotation files are only written for human readability. Set
+# DLC_WRITE_CSV=false to skip them, as writing them is much slower than the HDF files.
+_write_csv: bool = os.getenv("DLC_WRITE_CSV", "true").lower() in ("true", "1")
+
+# Each shuffle of a model comparison loads the merged annotation data, so the number of
+# shuffles created concurrently is capped to bound memory use. Set with
+# DLC_MAX_CONCURRENT_SHUFFLES (1 creates the shuffles one after the other).
+_max_concurrent_shuffles: int = int(os.getenv("DLC_MAX_CONCURRENT_SHUFFLES", "4"))
+
+# Guards reading and writing the merged annotation data, as PyTables is not thread-safe
+_collected_data_lock = threading.Lock()
+
+# Shared thread pool reading image headers, created on first use
+_image_io_pool: ThreadPoolExecutor | None = None
+_image_io_lock = threading.Lock()
+
+# When pyarrow is installed, the merged annotation data is also stored as Parquet,
+# which is much faster to load than the HDF file.
+_is_pyarrow_available = importlib.util.find_spec("pyarrow") is not None
+
+
+def _list_dir(path) -> dict[str, bool]:
+    """Lists the entries of a directory, mapping each name to whether it is a file.
+
+    A single ``os.scandir`` call gives both, without a ``stat`` call per entry. The
+    listing is not cached, as directory modification times are too coarse on some
+    file systems (e.g. FAT or network shares) to tell when it is stale.
+    """
+    with os.scandir(path) as entries:
+        return {entry.name: entry.is_file() for entry in entries}
+
+
+def _are_files(paths: list[str]) -> np.ndarray:
+    """Checks which paths are files, listing each of their directories only once.
+
+    The directories are listed anew on each call, so deleted images are never
+    reported as files. Paths missing from the listing are still checked with
+    ``os.path.isfile``, so that case-insensitive file systems give the same result.
+    """
+    listings = {}
+    are_files = np.zeros(len(paths), dtype=bool)
+    for i, path in enumerate(paths):
+        folder, name = os.path.split(path)
+        if folder not in listings:
+            try:
+                listings[folder] = _list_dir(folder)
+            except (FileNotFoundError, NotADirectoryError):
+                listings[folder] = {}
+        are_files[i] = listings[folder].get(name, False) or os.path.isfile(path)
+    return are_files
+
+
+def _stem(path: str) -> str:
+    """Faster equivalent of ``Path(path).stem`` for the video paths in a config."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _read_hdf(path: str | Path) -> pd.DataFrame:
+    """Reads annotation data from an HDF file, which is opened in read-only mode.
+
+    Raises:
+        FileNotFoundError: if there is no file at the given path.
+    """
+    with pd.HDFStore(path, mode="r") as store:
+        return pd.read_hdf(store)
+
+
+def _prefetch_files(paths: list[str]) -> None:
+    """Asks the OS to start reading files in the background, where this is supported.
+
+    The files are then read one after the other (PyTables is not thread-safe), but
+    without waiting on the disk for each one in turn.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+
+def _write_hdf(df: pd.DataFrame, path: str | Path) -> None:
+    """Writes annotation data to an HDF file, compressed with blosc:zstd.
+
+    The fixed format is kept, as the table format cannot store data with MultiIndex
+    rows and columns (which annotation data has).
+    """
+    df.to_hdf(path, key="df_with_missing", mode="w", complib="blosc:zstd", complevel=5)
+
+
+def _write_collected_data(
+    df: pd.DataFrame, filename: str, merge_key: str | None = None
+) -> None:
+    """Writes merged annotation data to an HDF file, and to Parquet when possible.
+
+    A random token is stored with both files, so that the Parquet copy is only read
+    when it was written together with the HDF file (file modification times can't
+    tell, as they are kept when restoring files from a backup).
+
+    Args:
+        df: the merged annotation data
+        filename: the path to write the data to, without file extension
+        merge_key: the key of the annotation files the data was merged from
+    """
+    h5_path = filename + ".h5"
+    _write_hdf(df, h5_path)
+    token = uuid.uuid4().hex if _is_pyarrow_available else None
+    with pd.HDFStore(h5_path, mode="a") as store:
+        attrs = store.get_storer("df_with_missing").attrs
+        attrs.merge_key = merge_key
+        attrs.parquet_token = token
+
+    if token is not None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df)
+        schema_metadata = {**table.schema.metadata, b"dlc_token": token.encode()}
+        pq.write_table(
+            table.replace_schema_metadata(schema_metadata), filename + ".parquet"
+        )
+
+
+def _read_collected_data(filename: str) -> pd.DataFrame:
+    """Reads merged annotation data, preferring the Parquet copy when it is current.
+
+    Args:
+        filename: the path to the merged annotation data, without file extension
+
+    Raises:
+        FileNotFoundError: if there is no HDF file with the merged annotation data.
+    """
+    h5_path = filename + ".h5"
+    parquet_path = filename + ".parquet"
+    if _is_pyarrow_available and os.path.isfile(parquet_path):
+        import pyarrow.parquet as pq
+
+        with pd.HDFStore(h5_path, mode="r") as store:
+            attrs = store.get_storer("df_with_missing").attrs
+            token = getattr(attrs, "parquet_token", None)
+        schema_metadata = pq.read_schema(parquet_path).metadata or {}
+        if token is not None and schema_metadata.get(b"dlc_token") == token.encode():
+            return pd.read_parquet(parquet_path)
+
+    return _read_hdf(h5_path)
+
 
 def comparevideolistsanddatafolders(config):
     """
@@ -48,12 +216,12 @@ def comparevideolistsanddatafolders(config):
         String containing the full path of the config file in the project.
 
     """
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     videos = cfg["video_sets"].keys()
-    video_names = [Path(i).stem for i in videos]
+    video_names = [_stem(i) for i in videos]
     alldatafolders = [
         fn
-        for fn in os.listdir(Path(config).parent / "labeled-data")
+        for fn in _list_dir(Path(config).parent / "labeled-data")
         if "_labeled" not in fn
     ]
 
@@ -87,42 +255,44 @@ def adddatasetstovideolistandviceversa(config):
     config : string
         String containing the full path of the config file in the project.
     """
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     videos = cfg["video_sets"]
-    video_names = [Path(i).stem for i in videos]
+    stem_to_videos = {}
+    for video in videos:
+        stem_to_videos.setdefault(_stem(video), []).append(video)
 
     alldatafolders = [
         fn
-        for fn in os.listdir(Path(config).parent / "labeled-data")
+        for fn in _list_dir(Path(config).parent / "labeled-data")
         if "_labeled" not in fn and not fn.startswith(".")
     ]
 
-    print("Config file contains:", len(video_names))
+    print("Config file contains:", len(videos))
     print("Labeled-data contains:", len(alldatafolders))
 
     toberemoved = []
-    for vn in video_names:
-        if vn not in alldatafolders:
+    datafolders = set(alldatafolders)
+    for vn, videos_with_name in stem_to_videos.items():
+        if vn not in datafolders:
             print(vn, " is missing as a labeled folder >> removing key!")
-            for fullvideo in videos:
-                if vn in fullvideo:
-                    toberemoved.append(fullvideo)
+            toberemoved.extend(videos_with_name)
 
     for vid in toberemoved:
         del videos[vid]
 
     # Load updated lists:
-    video_names = [Path(i).stem for i in videos]
+    video_names = [_stem(i) for i in videos]
+    stem_to_file = None
     for vn in alldatafolders:
         if vn not in video_names:
             print(vn, " is missing in config file >> adding it!")
             # Find the corresponding video file
-            found = False
-            for file in os.listdir(os.path.join(cfg["project_path"], "videos")):
-                if os.path.splitext(file)[0] == vn:
-                    found = True
-                    break
-            if found:
+            if stem_to_file is None:
+                stem_to_file = {}
+                for file in _list_dir(os.path.join(cfg["project_path"], "videos")):
+                    stem_to_file.setdefault(os.path.splitext(file)[0], file)
+            file = stem_to_file.get(vn)
+            if file is not None:
                 video_path = os.path.join(cfg["project_path"], "videos", file)
                 clip = VideoReader(video_path)
                 videos.update(
@@ -143,23 +313,26 @@ def dropduplicatesinannotatinfiles(config):
         String containing the full path of the config file in the project.
 
     """
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     videos = cfg["video_sets"].keys()
-    video_names = [Path(i).stem for i in videos]
+    video_names = [_stem(i) for i in videos]
     folders = [Path(config).parent / "labeled-data" / Path(i) for i in video_names]
 
     for folder in folders:
         try:
             fn = os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".h5")
-            DC = pd.read_hdf(fn)
-            numimages = len(DC.index)
-            DC = DC[~DC.index.duplicated(keep="first")]
-            if len(DC.index) < numimages:
-                print("Dropped", numimages - len(DC.index))
-                DC.to_hdf(fn, key="df_with_missing", mode="w")
-                DC.to_csv(
-                    os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".csv")
-                )
+            DC = _read_hdf(fn)
+            if not DC.index.is_unique:
+                keep = ~DC.index.duplicated(keep="first")
+                print("Dropped", len(keep) - keep.sum())
+                DC = DC.loc[keep]
+                _write_hdf(DC, fn)
+                if _write_csv:
+                    DC.to_csv(
+                        os.path.join(
+                            str(folder), "CollectedData_" + cfg["scorer"] + ".csv"
+                        )
+                    )
 
         except FileNotFoundError:
             print("Attention:", folder, "does not appear to have labeled data!")
@@ -176,31 +349,31 @@ def dropannotationfileentriesduetodeletedimages(config):
         String containing the full path of the config file in the project.
 
     """
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     videos = cfg["video_sets"].keys()
-    video_names = [Path(i).stem for i in videos]
+    video_names = [_stem(i) for i in videos]
     folders = [Path(config).parent / "labeled-data" / Path(i) for i in video_names]
 
     for folder in folders:
         fn = os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".h5")
         try:
-            DC = pd.read_hdf(fn)
+            DC = _read_hdf(fn)
         except FileNotFoundError:
             print("Attention:", folder, "does not appear to have labeled data!")
             continue
-        dropped = False
-        for imagename in DC.index:
-            if os.path.isfile(os.path.join(cfg["project_path"], *imagename)):
-                pass
-            else:
-                print("Dropping...", imagename)
-                DC = DC.drop(imagename)
-                dropped = True
-        if dropped == True:
-            DC.to_hdf(fn, key="df_with_missing", mode="w")
-            DC.to_csv(
-                os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".csv")
-            )
+        prefix = os.path.join(cfg["project_path"], "")
+        paths = [prefix + os.sep.join(idx) for idx in DC.index]
+        keep = _are_files(paths)
+        dropped = not keep.all()
+        for i in np.flatnonzero(~keep):
+            print("Dropping...", DC.index[i])
+        if dropped:
+            DC = DC.loc[keep]
+            _write_hdf(DC, fn)
+            if _write_csv:
+                DC.to_csv(
+                    os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".csv")
+                )
 
 
 def dropimagesduetolackofannotation(config):
@@ -213,42 +386,38 @@ def dropimagesduetolackofannotation(config):
     config : string
         String containing the full path of the config file in the project.
     """
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     videos = cfg["video_sets"].keys()
-    video_names = [Path(i).stem for i in videos]
+    video_names = [_stem(i) for i in videos]
     folders = [Path(config).parent / "labeled-data" / Path(i) for i in video_names]
 
     for folder in folders:
         h5file = os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".h5")
         try:
-            DC = pd.read_hdf(h5file)
+            DC = _read_hdf(h5file)
         except FileNotFoundError:
             print("Attention:", folder, "does not appear to have labeled data!")
             continue
         conversioncode.guarantee_multiindex_rows(DC)
-        annotatedimages = [fn[-1] for fn in DC.index]
-        imagelist = [fns for fns in os.listdir(str(folder)) if ".png" in fns]
-        print("Annotated images: ", len(annotatedimages), " In folder:", len(imagelist))
-        for imagename in imagelist:
-            if imagename in annotatedimages:
-                pass
-            else:
-                fullpath = os.path.join(
-                    cfg["project_path"], "labeled-data", folder, imagename
-                )
-                if os.path.isfile(fullpath):
-                    print("Deleting", fullpath)
-                    os.remove(fullpath)
+        annotatedimages = {fn[-1] for fn in DC.index}
+        entries = _list_dir(folder)
+        imagelist = [
+            fns for fns, is_file in entries.items() if is_file and fns.endswith(".png")
+        ]
+        print("Annotated images: ", len(DC.index), " In folder:", len(imagelist))
+        to_delete = [fns for fns in imagelist if fns not in annotatedimages]
+        for imagename in to_delete:
+            fullpath = os.path.join(folder, imagename)
+            print("Deleting", fullpath)
+            os.remove(fullpath)
 
-        annotatedimages = [fn[-1] for fn in DC.index]
-        imagelist = [fns for fns in os.listdir(str(folder)) if ".png" in fns]
         print(
             "PROCESSED:",
             folder,
             " now # of annotated images: ",
-            len(annotatedimages),
+            len(DC.index),
             " in folder:",
-            len(imagelist),
+            len(imagelist) - len(to_delete),
         )
 
 
@@ -263,15 +432,15 @@ def dropunlabeledframes(config):
         String containing the full path of the config file in the project.
 
     """
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     videos = cfg["video_sets"].keys()
-    video_names = [Path(i).stem for i in videos]
+    video_names = [_stem(i) for i in videos]
     folders = [Path(config).parent / "labeled-data" / Path(i) for i in video_names]
 
     for folder in folders:
         h5file = os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".h5")
         try:
-            DC = pd.read_hdf(h5file)
+            DC = _read_hdf(h5file)
         except FileNotFoundError:
             print("Skipping ", folder, "...")
             continue
@@ -280,10 +449,11 @@ def dropunlabeledframes(config):
         after_len = len(DC.index)
         dropped = before_len - after_len
         if dropped:
-            DC.to_hdf(h5file, key="df_with_missing", mode="w")
-            DC.to_csv(
-                os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".csv")
-            )
+            _write_hdf(DC, h5file)
+            if _write_csv:
+                DC.to_csv(
+                    os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".csv")
+                )
 
             print("Dropped ", dropped, "entries in ", folder)
 
@@ -342,18 +512,17 @@ def check_labels(
 
     from deeplabcut.utils import visualization
 
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     videos = cfg["video_sets"].keys()
     video_names = [_robust_path_split(video)[1] for video in videos]
 
     folders = [
-        os.path.join(cfg["project_path"], "labeled-data", str(Path(i)))
-        for i in video_names
+        os.path.join(cfg["project_path"], "labeled-data", i) for i in video_names
     ]
     print("Creating images with labels by %s." % cfg["scorer"])
     for folder in folders:
         try:
-            DataCombined = pd.read_hdf(
+            DataCombined = _read_hdf(
                 os.path.join(str(folder), "CollectedData_" + cfg["scorer"] + ".h5")
             )
             conversioncode.guarantee_multiindex_rows(DataCombined)
@@ -388,39 +557,59 @@ def boxitintoacell(joints):
 
 
 def ParseYaml(configfile):
-    raw = open(configfile).read()
+    # The parsed documents are cached for as long as the file is unchanged on disk, as
+    # the same pose_cfg.yaml template is parsed for every shuffle that is created.
+    path = os.path.abspath(configfile)
+    return copy.deepcopy(_parse_yaml_cached(path, os.stat(path).st_mtime_ns))
+
+
+@lru_cache(maxsize=16)
+def _parse_yaml_cached(path: str, mtime_ns: int) -> list:
+    with open(path) as f:
+        raw = f.read()
     docs = []
     for raw_doc in raw.split("\n---"):
         try:
-            docs.append(yaml.load(raw_doc, Loader=yaml.SafeLoader))
+            docs.append(yaml.load(raw_doc, Loader=_YamlLoader))
         except SyntaxError:
             docs.append(raw_doc)
     return docs
 
 
+def _write_yaml(path: str | Path, data: dict) -> None:
+    """Dumps the data to a string first, so the file is written with a single call"""
+    content = yaml.dump(data, Dumper=_YamlDumper)
+    with open(path, "w") as f:
+        f.write(content)
+
+
 def MakeTrain_pose_yaml(
     itemstochange,
     saveasconfigfile,
     defaultconfigfile,
     items2drop: dict | None = None,
     save: bool = True,
+    preparsed: dict | None = None,
 ):
+    # The template can be parsed once by the caller and passed as ``preparsed`` when
+    # creating several configs from it; its top-level keys are copied, not modified.
     if items2drop is None:
         items2drop = {}
 
-    docs = ParseYaml(defaultconfigfile)
+    if preparsed is not None:
+        pose_cfg = dict(preparsed)
+    else:
+        pose_cfg = ParseYaml(defaultconfigfile)[0]
+
     for key in items2drop.keys():
-        if key in docs[0].keys():
-            docs[0].pop(key)
+        pose_cfg.pop(key, None)
 
-    for key in itemstochange.keys():
-        docs[0][key] = itemstochange[key]
+    pose_cfg.update(itemstochange)
 
     if save:
-        with open(saveasconfigfile, "w") as f:
-            yaml.dump(docs[0], f)
+        _write_yaml(saveasconfigfile, pose_cfg)
 
-    return docs[0]
+    return pose_cfg
 
 
 def MakeTest_pose_yaml(
@@ -447,8 +636,7 @@ def MakeTest_pose_yaml(
         dict_test["locref_smooth"] = locref_smooth
 
     dict_test["scoremap_dir"] = "test"
-    with open(saveasfile, "w") as f:
-        yaml.dump(dict_test, f)
+    _write_yaml(saveasfile, dict_test)
 
 
 def MakeInference_yaml(itemstochange, saveasconfigfile, defaultconfigfile):
@@ -456,8 +644,7 @@ def MakeInference_yaml(itemstochange, saveasconfigfile, defaultconfigfile):
     for key in itemstochange.keys():
         docs[0][key] = itemstochange[key]
 
-    with open(saveasconfigfile, "w") as f:
-        yaml.dump(docs[0], f)
+    _write_yaml(saveasconfigfile, docs[0])
     return docs[0]
 
 
@@ -499,20 +686,24 @@ def parse_video_filenames(videos: List[str]) -> List[str]:
     filenames = []
     filename_to_videos = {}
     for video in videos:
-        if Path(video).suffix.lower() == ".avi":
+        path = Path(video)
+        if path.suffix.lower() == ".avi":
             _, filename, _ = _robust_path_split(video)
         else:
-            filename = Path(video).stem  # Get the filename without extension
-            parent = Path(video).parent.name
-            parent_parent = Path(video).parent.parent.name
-            filename = f'{parent_parent}_{parent}_{filename}'
-            print(f'Using filename: {filename} for parent: {parent} and parent_parent: {parent_parent}')
-        videos_with_filename = filename_to_videos.get(filename, [])
-        if len(videos_with_filename) == 0:
+            parent = path.parent.name
+            parent_parent = path.parent.parent.name
+            filename = f"{parent_parent}_{parent}_{path.stem}"
+            logging.debug(
+                "Using filename: %s for parent: %s and parent_parent: %s",
+                filename,
+                parent,
+                parent_parent,
+            )
+        videos_with_filename = filename_to_videos.setdefault(filename, [])
+        if not videos_with_filename:
             filenames.append(filename)
 
         videos_with_filename.append(video)
-        filename_to_videos[filename] = videos_with_filename
 
     for filename, videos in filename_to_videos.items():
         if len(videos) > 1:
@@ -535,15 +726,12 @@ def merge_annotateddatasets(cfg, trainingsetfolder_full):
     Within platform comp. is straightforward. But if someone labels on windows and wants to train on a unix cluster or colab...
     """
     AnnotationData = []
-    data_path = Path(os.path.join(cfg["project_path"], "labeled-data"))
-    videos = cfg["video_sets"].keys()
-    video_filenames = parse_video_filenames(videos)
-    for filename in video_filenames:
-        file_path = os.path.join(
-            data_path / filename, f'CollectedData_{cfg["scorer"]}.h5'
-        )
+    file_paths = _annotation_file_paths(cfg)
+    merge_key = _merge_key(cfg, file_paths)
+    _prefetch_files(file_paths)
+    for file_path in file_paths:
         try:
-            data = pd.read_hdf(file_path)
+            data = _read_hdf(file_path)
             conversioncode.guarantee_multiindex_rows(data)
             if data.columns.levels[0][0] != cfg["scorer"]:
                 print(
@@ -580,11 +768,85 @@ def merge_annotateddatasets(cfg, trainingsetfolder_full):
         bodyparts, axis=1, level=AnnotationData.columns.names.index("bodyparts")
     )
     filename = os.path.join(trainingsetfolder_full, f'CollectedData_{cfg["scorer"]}')
-    AnnotationData.to_hdf(filename + ".h5", key="df_with_missing", mode="w")
-    AnnotationData.to_csv(filename + ".csv")  # human readable.
+    _write_collected_data(AnnotationData, filename, merge_key)
+    if _write_csv:
+        AnnotationData.to_csv(filename + ".csv")  # human readable.
     return AnnotationData
 
 
+def merge_annotateddatasets_cached(cfg, trainingsetfolder_full):
+    """
+    Same as ``merge_annotateddatasets``, but reuses the merged annotation data stored
+    in the training set folder when none of the per-video annotation files (nor the
+    bodyparts and scorer in the config) changed since it was written.
+    """
+    merge_key = _merge_key(cfg, _annotation_file_paths(cfg))
+    filename = os.path.join(trainingsetfolder_full, f'CollectedData_{cfg["scorer"]}')
+    # PyTables is not thread-safe, and shuffles can be created concurrently
+    with _collected_data_lock:
+        if merge_key is not None:
+            try:
+                with pd.HDFStore(filename + ".h5", mode="r") as store:
+                    attrs = store.get_storer("df_with_missing").attrs
+                    cached_key = getattr(attrs, "merge_key", None)
+            except (FileNotFoundError, KeyError):
+                cached_key = None
+
+            if cached_key == merge_key:
+                return _read_collected_data(filename)
+
+        return merge_annotateddatasets(cfg, trainingsetfolder_full)
+
+
+def _is_merge_cached(cfg: dict) -> bool:
+    """Whether ``merge_annotateddatasets_cached`` can reuse the merged data.
+
+    This is not the case when none of the per-video annotation files are found (the
+    data is then merged from other files each time).
+    """
+    return _merge_key(cfg, _annotation_file_paths(cfg)) is not None
+
+
+def _annotation_file_paths(cfg: dict) -> list[str]:
+    data_path = Path(os.path.join(cfg["project_path"], "labeled-data"))
+    video_filenames = parse_video_filenames(cfg["video_sets"].keys())
+    return [
+        os.path.join(data_path / filename, f'CollectedData_{cfg["scorer"]}.h5')
+        for filename in video_filenames
+    ]
+
+
+def _merge_key(cfg: dict, file_paths: list[str]) -> str | None:
+    """Hashes everything the merged annotation data depends on.
+
+    Returns None when none of the annotation files exist, as the data is then merged
+    from other files (see ``merge_windowsannotationdataONlinuxsystem``).
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for key in (
+        "scorer",
+        "multianimalproject",
+        "individuals",
+        "bodyparts",
+        "multianimalbodyparts",
+        "uniquebodyparts",
+    ):
+        hasher.update(f"{key}:{cfg.get(key)!r};".encode())
+
+    # the size is hashed too, as modification times are kept when restoring backups
+    found = False
+    for path in file_paths:
+        try:
+            stat = os.stat(path)
+            found = True
+        except FileNotFoundError:
+            hasher.update(f"{path}:missing;".encode())
+            continue
+        hasher.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+
+    return hasher.hexdigest() if found else None
+
+
 def SplitTrials(
     trialindex,
     trainFraction=0.8,
@@ -610,9 +872,15 @@ def SplitTrials(
         index_len = len(trialindex)
         train_fraction = round(trainFraction, 2)
         train_size = index_len * train_fraction
-        shuffle = np.random.permutation(trialindex)
-        test_indices = shuffle[int(train_size) :]
-        train_indices = shuffle[: int(train_size)]
+        # Permuting positions rather than the index itself gives the same result
+        # for the same global random state, without copying the trial index.
+        permutation = np.random.permutation(index_len)
+        if isinstance(trialindex, range):
+            trialindex = np.arange(trialindex.start, trialindex.stop, trialindex.step)
+        else:
+            trialindex = np.asarray(trialindex)
+        test_indices = trialindex[permutation[int(train_size) :]]
+        train_indices = trialindex[permutation[: int(train_size)]]
         if enforce_train_fraction and not train_size.is_integer():
             train_indices, test_indices = pad_train_test_indices(
                 train_indices,
@@ -686,31 +954,38 @@ def mergeandsplit(config, trainindex=0, uniform=True):
 
     """
     # Loading metadata from config file:
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
+    Data = _load_labeled_data(cfg)
+    if Data is None:
+        return [], []
+
+    return _split_labeled_data(cfg, Data, trainindex, uniform)
+
+
+def _load_labeled_data(cfg: dict) -> pd.DataFrame | None:
+    """Loads the merged annotation data of the scorer, merging it if needed.
+
+    The data is loaded like in ``create_training_dataset``, so that splits are drawn
+    from the same (up-to-date) data that is used to create the training dataset.
+    """
     scorer = cfg["scorer"]
-    project_path = cfg["project_path"]
     # Create path for training sets & store data there
-    trainingsetfolder = auxiliaryfunctions.get_training_set_folder(
-        cfg
-    )  # Path concatenation OS platform independent
-    auxiliaryfunctions.attempt_to_make_folder(
-        Path(os.path.join(project_path, str(trainingsetfolder))), recursive=True
+    trainingsetfolder_full = Path(cfg["project_path"]) / (
+        auxiliaryfunctions.get_training_set_folder(cfg)
     )
-    fn = os.path.join(project_path, trainingsetfolder, "CollectedData_" + cfg["scorer"])
-
-    try:
-        Data = pd.read_hdf(fn + ".h5")
-    except FileNotFoundError:
-        Data = merge_annotateddatasets(
-            cfg,
-            Path(os.path.join(project_path, trainingsetfolder)),
-        )
-        if Data is None:
-            return [], []
+    trainingsetfolder_full.mkdir(parents=True, exist_ok=True)
+    Data = merge_annotateddatasets_cached(cfg, trainingsetfolder_full)
+    if Data is None:
+        return None
 
     conversioncode.guarantee_multiindex_rows(Data)
-    Data = Data[scorer]  # extract labeled data
+    return Data[scorer]  # extract labeled data (a view, the data is not copied)
+
 
+def _split_labeled_data(
+    cfg: dict, Data: pd.DataFrame, trainindex: int, uniform: bool
+) -> tuple:
+    """Splits the labeled data as described in ``mergeandsplit``."""
     if uniform == True:
         TrainingFraction = cfg["TrainingFraction"]
         trainFraction = TrainingFraction[trainindex]
@@ -721,15 +996,13 @@ def mergeandsplit(config, trainindex=0, uniform=True):
         )
     else:  # leave one folder out split
         videos = cfg["video_sets"].keys()
-        test_video_name = [Path(i).stem for i in videos][trainindex]
+        test_video_name = [_stem(i) for i in videos][trainindex]
         print("Excluding the following folder (from training):", test_video_name)
-        trainIndices, testIndices = [], []
-        for index, name in enumerate(Data.index):
-            if test_video_name == name[1]:  # this is the video name
-                # print(name,test_video_name)
-                testIndices.append(index)
-            else:
-                trainIndices.append(index)
+        # the second level of the index is the video name
+        is_test = Data.index.get_level_values(1) == test_video_name
+        indices = np.arange(len(Data.index))
+        trainIndices = indices[~is_test].tolist()
+        testIndices = indices[is_test].tolist()
 
     return trainIndices, testIndices
 
@@ -742,47 +1015,77 @@ def read_image_shape_fast(path):
         return len(img.getbands()), height, width
 
 
+def _image_io_executor() -> ThreadPoolExecutor:
+    """Returns the thread pool used to read image headers.
+
+    A single bounded pool is shared by all callers, so that creating splits or
+    shuffles concurrently doesn't multiply the number of threads opening images.
+    """
+    global _image_io_pool
+    with _image_io_lock:
+        if _image_io_pool is None:
+            _image_io_pool = ThreadPoolExecutor(
+                max_workers=min(32, (os.cpu_count() or 1) * 4),
+                thread_name_prefix="dlc-image-io",
+            )
+        return _image_io_pool
+
+
+def _read_image_shapes(paths: list[str]) -> list[tuple[int, int, int]]:
+    """Reads the shapes of images concurrently, as this is bound by disk IO."""
+    return list(_image_io_executor().map(read_image_shape_fast, paths))
+
+
 def format_training_data(df, train_inds, nbodyparts, project_path):
     train_data = []
-    matlab_data = []
 
     def to_matlab_cell(array):
         outer = np.array([[None]], dtype=object)
         outer[0, 0] = array.astype("int64")
         return outer
 
-    for i in train_inds:
-        data = dict()
-        filename = df.index[i]
-        data["image"] = filename
-        img_shape = read_image_shape_fast(os.path.join(project_path, *filename))
-        data["size"] = img_shape
-        temp = df.iloc[i].values.reshape(-1, 2)
-        joints = np.c_[range(nbodyparts), temp]
-        joints = joints[~np.isnan(joints).any(axis=1)].astype(int)
-        # Check that points lie within the image
-        inside = np.logical_and(
-            np.logical_and(joints[:, 1] < img_shape[2], joints[:, 1] > 0),
-            np.logical_and(joints[:, 2] < img_shape[1], joints[:, 2] > 0),
-        )
-        if not all(inside):
-            joints = joints[inside]
-        if joints.size:  # Exclude images without labels
-            data["joints"] = joints
-            train_data.append(data)
-            matlab_data.append(
-                (
-                    np.array([data["image"]], dtype="U"),
-                    np.array([data["size"]]),
-                    to_matlab_cell(data["joints"]),
-                )
-            )
-    matlab_data = np.asarray(
-        matlab_data, dtype=[("image", "O"), ("size", "O"), ("joints", "O")]
+    filenames = [df.index[i] for i in train_inds]
+    img_shapes = _read_image_shapes(
+        [os.path.join(project_path, *filename) for filename in filenames]
     )
+    coords = df.to_numpy().reshape(len(df), nbodyparts, 2)[train_inds]
+    labeled = ~np.isnan(coords).any(axis=2)
+    # Keypoints are truncated to integer pixels, then the ones outside of the image
+    # are dropped, for all frames at once
+    xy = np.zeros(coords.shape, dtype=int)
+    xy[labeled] = coords[labeled].astype(int)
+    sizes = np.asarray(img_shapes, dtype=int).reshape(-1, 3)
+    x, y = xy[..., 0], xy[..., 1]
+    valid = labeled & (x < sizes[:, 2:]) & (x > 0) & (y < sizes[:, 1:2]) & (y > 0)
+    bodypart_ids = np.arange(nbodyparts)
+    frames = np.flatnonzero(valid.any(axis=1))  # Exclude images without labels
+    matlab_data = np.empty(
+        len(frames), dtype=[("image", "O"), ("size", "O"), ("joints", "O")]
+    )
+    for n, k in enumerate(frames):
+        filename, img_shape = filenames[k], img_shapes[k]
+        joints = np.column_stack((bodypart_ids[valid[k]], xy[k][valid[k]]))
+        train_data.append(dict(image=filename, size=img_shape, joints=joints))
+        matlab_data["image"][n] = np.array([filename], dtype="U")
+        matlab_data["size"][n] = np.array([img_shape])
+        matlab_data["joints"][n] = to_matlab_cell(joints)
     return train_data, matlab_data
 
 
+def _save_matlab_data(path: str, matlab_data: np.ndarray) -> None:
+    """Saves the training data as a MATLAB v5 file, as read by the pose datasets.
+
+    The file is serialized in memory and written with a single call, as ``savemat``
+    otherwise issues a few small writes for each cell of the dataset.
+    """
+    import scipy.io as sio
+
+    buffer = io.BytesIO()
+    sio.savemat(buffer, {"dataset": matlab_data})
+    with open(path, "wb") as f:
+        f.write(buffer.getbuffer())
+
+
 def create_training_dataset(
     config,
     num_shuffles=1,
@@ -974,8 +1277,6 @@ def create_training_dataset(
             'C:\\Users\\Ulf\\looming-task\\config.yaml', Shuffles=[3,17,5],
         )
     """
-    import scipy.io as sio
-
     if windows2linux:
         # DeprecationWarnings are silenced since Python 3.2 unless triggered in __main__
         warnings.warn(
@@ -984,7 +1285,7 @@ def create_training_dataset(
         )
 
     # Loading metadata from config file:
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     dlc_root_path = auxiliaryfunctions.get_deeplabcut_path()
 
     if superanimal_name != "":
@@ -1008,9 +1309,10 @@ def create_training_dataset(
             )
         else:
             print("Reloading pose_cfg parameters from " + posecfg_template + "\n")
-            from deeplabcut.utils.auxiliaryfunctions import read_plainconfig
 
-        prior_cfg = read_plainconfig(posecfg_template)
+        # user-supplied templates are read with ruamel, which accepts python tags
+        # (e.g. tuples and paths) and gives a clear error if the file is missing
+        prior_cfg = auxiliaryfunctions.read_plainconfig(posecfg_template)
     if cfg.get("multianimalproject", False):
         from deeplabcut.generate_training_dataset.multiple_individuals_trainingsetmanipulation import (
             create_multianimaltraining_dataset,
@@ -1039,22 +1341,18 @@ def create_training_dataset(
         trainingsetfolder = auxiliaryfunctions.get_training_set_folder(
             cfg
         )  # Path concatenation OS platform independent
-        auxiliaryfunctions.attempt_to_make_folder(
-            Path(os.path.join(project_path, str(trainingsetfolder))), recursive=True
-        )
+        trainingsetfolder_full = Path(project_path) / trainingsetfolder
+        trainingsetfolder_full.mkdir(parents=True, exist_ok=True)
 
         # Create the trainset metadata file, if it doesn't yet exist
         if not metadata.TrainingDatasetMetadata.path(cfg).exists():
             trainset_metadata = metadata.TrainingDatasetMetadata.create(cfg)
             trainset_metadata.save()
 
-        Data = merge_annotateddatasets(
-            cfg,
-            Path(os.path.join(project_path, trainingsetfolder)),
-        )
+        Data = merge_annotateddatasets_cached(cfg, trainingsetfolder_full)
         if Data is None:
             return
-        Data = Data[scorer]  # extract labeled data
+        Data = Data[scorer]  # extract labeled data (a view, the data is not copied)
 
         # loading & linking pretrained models
         if net_type is None:  # loading & linking pretrained models
@@ -1128,6 +1426,8 @@ def create_training_dataset(
             model_path = dlcparent_path
         else:
             model_path = auxfun_models.check_for_weights(net_type, Path(dlcparent_path))
+            # parsed once, as a pose config is created from it for each split
+            default_pose_cfg = ParseYaml(defaultconfigfile)[0]
 
         Shuffles = validate_shuffles(cfg, Shuffles, num_shuffles, userfeedback)
 
@@ -1168,191 +1468,200 @@ def create_training_dataset(
 
         bodyparts = auxiliaryfunctions.get_bodyparts(cfg)
         nbodyparts = len(bodyparts)
+        splits_to_create = []
         for trainFraction, shuffle, (trainIndices, testIndices) in splits:
             if len(trainIndices) > 0:
                 if userfeedback:
-                    trainposeconfigfile, _, _ = compat.return_train_network_path(
-                        config,
-                        shuffle=shuffle,
-                        trainingsetindex=cfg["TrainingFraction"].index(trainFraction),
-                        engine=engine,
+                    # same path as given by compat.return_train_network_path, without
+                    # reading the project config again for each split
+                    trainposeconfigfile = (
+                        Path(project_path)
+                        / auxiliaryfunctions.get_model_folder(
+                            trainFraction, shuffle, cfg, engine=engine
+                        )
+                        / "train"
+                        / engine.pose_cfg_name
                     )
                     if trainposeconfigfile.is_file():
                         askuser = input(
                             "The model folder is already present. If you continue, it will overwrite the existing model (split). Do you want to continue?(yes/no): "
                         )
-                        if (
-                            askuser == "no"
-                            or askuser == "No"
-                            or askuser == "N"
-                            or askuser == "No"
-                        ):
+                        if askuser.strip().lower() in {"no", "n"}:
                             raise Exception(
                                 "Use the Shuffles argument as a list to specify a different shuffle index. Check out the help for more details."
                             )
-
-                ####################################################
-                # Generating data structure with labeled information & frame metadata (for deep cut)
-                ####################################################
-                # Make training file!
-                (
-                    datafilename,
-                    metadatafilename,
-                ) = auxiliaryfunctions.get_data_and_metadata_filenames(
-                    trainingsetfolder, trainFraction, shuffle, cfg
+                splits_to_create.append(
+                    (trainFraction, shuffle, trainIndices, testIndices)
                 )
 
-                ################################################################################
-                # Saving data file (convert to training file for deeper cut (*.mat))
-                ################################################################################
-                data, MatlabData = format_training_data(
-                    Data, trainIndices, nbodyparts, project_path
-                )
-                sio.savemat(
-                    os.path.join(project_path, datafilename), {"dataset": MatlabData}
-                )
+        # The splits are independent and creating them is mostly bound by disk IO
+        # (writing the dataset, the metadata and the pose configs), so they are created
+        # concurrently once the user confirmed that existing models can be overwritten.
+        if engine == Engine.PYTORCH:
+            from deeplabcut.pose_estimation_pytorch.config.make_pose_config import (
+                make_pytorch_pose_config,
+                make_pytorch_test_config,
+            )
+            from deeplabcut.pose_estimation_pytorch.modelzoo.config import (
+                make_super_animal_finetune_config,
+            )
 
-                ################################################################################
-                # Saving metadata (Pickle file)
-                ################################################################################
-                auxiliaryfunctions.save_metadata(
-                    os.path.join(project_path, metadatafilename),
-                    data,
-                    trainIndices,
-                    testIndices,
-                    trainFraction,
-                )
-                metadata.update_metadata(
-                    cfg=cfg,
-                    train_fraction=trainFraction,
-                    shuffle=shuffle,
-                    engine=engine,
-                    train_indices=trainIndices,
-                    test_indices=testIndices,
-                    overwrite=not userfeedback,
-                )
+        def create_split(trainFraction, shuffle, trainIndices, testIndices):
+            ####################################################
+            # Generating data structure with labeled information & frame metadata (for deep cut)
+            ####################################################
+            # Make training file!
+            (
+                datafilename,
+                metadatafilename,
+            ) = auxiliaryfunctions.get_data_and_metadata_filenames(
+                trainingsetfolder, trainFraction, shuffle, cfg
+            )
 
-                ################################################################################
-                # Creating file structure for training &
-                # Test files as well as pose_yaml files (containing training and testing information)
-                #################################################################################
-                modelfoldername = auxiliaryfunctions.get_model_folder(
-                    trainFraction,
-                    shuffle,
-                    cfg,
-                    engine=engine,
-                )
-                auxiliaryfunctions.attempt_to_make_folder(
-                    Path(config).parents[0] / modelfoldername, recursive=True
-                )
-                auxiliaryfunctions.attempt_to_make_folder(
-                    str(Path(config).parents[0] / modelfoldername) + "/train"
-                )
-                auxiliaryfunctions.attempt_to_make_folder(
-                    str(Path(config).parents[0] / modelfoldername) + "/test"
+            ################################################################################
+            # Saving data file (convert to training file for deeper cut (*.mat))
+            ################################################################################
+            data, MatlabData = format_training_data(
+                Data, trainIndices, nbodyparts, project_path
+            )
+            _save_matlab_data(os.path.join(project_path, datafilename), MatlabData)
+
+            ################################################################################
+            # Saving metadata (Pickle file)
+            ################################################################################
+            auxiliaryfunctions.save_metadata(
+                os.path.join(project_path, metadatafilename),
+                data,
+                trainIndices,
+                testIndices,
+                trainFraction,
+            )
+            metadata.update_metadata(
+                cfg=cfg,
+                train_fraction=trainFraction,
+                shuffle=shuffle,
+                engine=engine,
+                train_indices=trainIndices,
+                test_indices=testIndices,
+                overwrite=not userfeedback,
+            )
+
+            ################################################################################
+            # Creating file structure for training &
+            # Test files as well as pose_yaml files (containing training and testing information)
+            #################################################################################
+            modelfoldername = auxiliaryfunctions.get_model_folder(
+                trainFraction,
+                shuffle,
+                cfg,
+                engine=engine,
+            )
+            model_folder = Path(project_path) / modelfoldername
+            train_folder = model_folder / "train"
+            test_folder = model_folder / "test"
+            train_folder.mkdir(parents=True, exist_ok=True)
+            test_folder.mkdir(exist_ok=True)
+
+            path_train_config = str(train_folder / engine.pose_cfg_name)
+            path_test_config = str(test_folder / "pose_cfg.yaml")
+            if engine == Engine.TF:
+                items2change = {
+                    "dataset": datafilename,
+                    "engine": engine.aliases[0],
+                    "metadataset": metadatafilename,
+                    "num_joints": len(bodyparts),
+                    "all_joints": [[i] for i in range(len(bodyparts))],
+                    "all_joints_names": [str(bpt) for bpt in bodyparts],
+                    "init_weights": model_path,
+                    "project_path": str(cfg["project_path"]),
+                    "net_type": net_type,
+                    "dataset_type": augmenter_type,
+                }
+
+                items2drop = {}
+                if augmenter_type == "scalecrop":
+                    # these values are dropped as scalecrop
+                    # doesn't have rotation implemented
+                    items2drop = {"rotation": 0, "rotratio": 0.0}
+                # Also drop maDLC smart cropping augmentation parameters
+                for key in [
+                    "pre_resize",
+                    "crop_size",
+                    "max_shift",
+                    "crop_sampling",
+                ]:
+                    items2drop[key] = None
+
+                trainingdata = MakeTrain_pose_yaml(
+                    items2change,
+                    path_train_config,
+                    defaultconfigfile,
+                    items2drop,
+                    save=(engine == Engine.TF),
+                    preparsed=default_pose_cfg,
                 )
 
-                path_train_config = str(
-                    os.path.join(
-                        cfg["project_path"],
-                        Path(modelfoldername),
-                        "train",
-                        engine.pose_cfg_name,
-                    )
+                keys2save = [
+                    "dataset",
+                    "num_joints",
+                    "all_joints",
+                    "all_joints_names",
+                    "net_type",
+                    "init_weights",
+                    "global_scale",
+                    "location_refinement",
+                    "locref_stdev",
+                ]
+                MakeTest_pose_yaml(trainingdata, keys2save, path_test_config)
+                print(
+                    "The training dataset is successfully created. Use the function"
+                    "'train_network' to start training. Happy training!"
                 )
-                path_test_config = str(
-                    os.path.join(
-                        cfg["project_path"],
-                        Path(modelfoldername),
-                        "test",
-                        "pose_cfg.yaml",
+            elif engine == Engine.PYTORCH:
+                if weight_init is not None and weight_init.with_decoder:
+                    pytorch_cfg = make_super_animal_finetune_config(
+                        project_config=cfg,
+                        pose_config_path=path_train_config,
+                        model_name=net_type,
+                        detector_name=detector_type,
+                        weight_init=weight_init,
+                        save=True,
                     )
-                )
-                if engine == Engine.TF:
-                    items2change = {
-                        "dataset": datafilename,
-                        "engine": engine.aliases[0],
-                        "metadataset": metadatafilename,
-                        "num_joints": len(bodyparts),
-                        "all_joints": [[i] for i in range(len(bodyparts))],
-                        "all_joints_names": [str(bpt) for bpt in bodyparts],
-                        "init_weights": model_path,
-                        "project_path": str(cfg["project_path"]),
-                        "net_type": net_type,
-                        "dataset_type": augmenter_type,
-                    }
-
-                    items2drop = {}
-                    if augmenter_type == "scalecrop":
-                        # these values are dropped as scalecrop
-                        # doesn't have rotation implemented
-                        items2drop = {"rotation": 0, "rotratio": 0.0}
-                    # Also drop maDLC smart cropping augmentation parameters
-                    for key in [
-                        "pre_resize",
-                        "crop_size",
-                        "max_shift",
-                        "crop_sampling",
-                    ]:
-                        items2drop[key] = None
-
-                    trainingdata = MakeTrain_pose_yaml(
-                        items2change,
-                        path_train_config,
-                        defaultconfigfile,
-                        items2drop,
-                        save=(engine == Engine.TF),
+                else:
+                    pytorch_cfg = make_pytorch_pose_config(
+                        project_config=cfg,
+                        pose_config_path=path_train_config,
+                        net_type=net_type,
+                        top_down=top_down,
+                        detector_type=detector_type,
+                        weight_init=weight_init,
+                        save=True,
+                        ctd_conditions=ctd_conditions,
                     )
 
-                    keys2save = [
-                        "dataset",
-                        "num_joints",
-                        "all_joints",
-                        "all_joints_names",
-                        "net_type",
-                        "init_weights",
-                        "global_scale",
-                        "location_refinement",
-                        "locref_stdev",
-                    ]
-                    MakeTest_pose_yaml(trainingdata, keys2save, path_test_config)
-                    print(
-                        "The training dataset is successfully created. Use the function"
-                        "'train_network' to start training. Happy training!"
-                    )
-                elif engine == Engine.PYTORCH:
-                    from deeplabcut.pose_estimation_pytorch.config.make_pose_config import (
-                        make_pytorch_pose_config,
-                        make_pytorch_test_config,
-                    )
-                    from deeplabcut.pose_estimation_pytorch.modelzoo.config import (
-                        make_super_animal_finetune_config,
-                    )
+                make_pytorch_test_config(pytorch_cfg, path_test_config, save=True)
+
+        # a single split (e.g. for each shuffle of a model comparison, which are
+        # themselves created concurrently) is created without a thread pool
+        if len(splits_to_create) == 1:
+            create_split(*splits_to_create[0])
+        elif len(splits_to_create) > 1:
+            max_workers = min(len(splits_to_create), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(create_split, *split) for split in splits_to_create
+                ]
+                for future in futures:
+                    future.result()
 
-                    if weight_init is not None and weight_init.with_decoder:
-                        pytorch_cfg = make_super_animal_finetune_config(
-                            project_config=cfg,
-                            pose_config_path=path_train_config,
-                            model_name=net_type,
-                            detector_name=detector_type,
-                            weight_init=weight_init,
-                            save=True,
-                        )
-                    else:
-                        pytorch_cfg = make_pytorch_pose_config(
-                            project_config=cfg,
-                            pose_config_path=path_train_config,
-                            net_type=net_type,
-                            top_down=top_down,
-                            detector_type=detector_type,
-                            weight_init=weight_init,
-                            save=True,
-                            ctd_conditions=ctd_conditions,
-                        )
+        return splits
 
-                    make_pytorch_test_config(pytorch_cfg, path_test_config, save=True)
 
-        return splits
+# Matches the names of the documentation files created for each shuffle, capturing
+# the train fraction (in percent) and the shuffle index
+_DOCUMENTATION_FILE_RE = re.compile(
+    r"^Documentation_data.*_(\d+)shuffle(\d+)\.pickle$", flags=re.ASCII
+)
 
 
 def get_largestshuffle_index(config):
@@ -1383,38 +1692,26 @@ def get_existing_shuffle_indices(
         ascending index
     """
 
-    def is_valid_data_stem(stem: str) -> bool:
-        if len(stem) == 0:
-            return False
-        suffix = stem.split("_")[-1]
-        if len(suffix) == 0:
-            return False
-        info = suffix.split("shuffle")
-        if len(info) != 2:
-            return False
-        train_frac, idx = info
-        return (
-            train_frac.isdigit()
-            and idx.isdigit()
-            and (train_fraction is None or int(train_frac) == int(100 * train_fraction))
-        )
-
     if isinstance(cfg, (str, Path)):
-        cfg = auxiliaryfunctions.read_config(cfg)
+        cfg = auxiliaryfunctions.read_config_cached(cfg)
 
     project = Path(cfg["project_path"])
     trainset_folder = project / auxiliaryfunctions.get_training_set_folder(cfg)
-    if not trainset_folder.exists():
+    try:
+        with os.scandir(trainset_folder) as entries:
+            matches = [
+                _DOCUMENTATION_FILE_RE.match(entry.name)
+                for entry in entries
+                if entry.is_file()
+            ]
+    except FileNotFoundError:
         return []
 
     shuffle_indices = [
-        int(p.stem.split("shuffle")[-1])
-        for p in trainset_folder.iterdir()
-        if (
-            p.stem.startswith("Documentation_data")
-            and p.suffix == ".pickle"
-            and is_valid_data_stem(p.stem)
-        )
+        int(m.group(2))
+        for m in matches
+        if m is not None
+        and (train_fraction is None or int(m.group(1)) == int(100 * train_fraction))
     ]
     if engine is not None:
         if train_fraction is None:
@@ -1445,6 +1742,11 @@ def validate_shuffles(
     num_shuffles: int | None,
     userfeedback: bool,
 ) -> list[int]:
+    if shuffles is not None:
+        shuffles = [i for i in shuffles if isinstance(i, int)]
+        if not userfeedback:  # existing shuffles can be overwritten
+            return shuffles
+
     existing_shuffles = get_existing_shuffle_indices(cfg)
     if shuffles is None:
         first_index = 1
@@ -1453,9 +1755,9 @@ def validate_shuffles(
 
         shuffles = range(first_index, num_shuffles + first_index)
     else:
-        shuffles = [i for i in shuffles if isinstance(i, int)]
+        existing = set(existing_shuffles)
         for shuffle_idx in shuffles:
-            if userfeedback and shuffle_idx in existing_shuffles:
+            if shuffle_idx in existing:
                 raise ValueError(
                     f"Cannot create shuffle {shuffle_idx} as it already exists - "
                     f"you must either create the dataset with `userfeedback=False` "
@@ -1564,7 +1866,7 @@ def create_training_model_comparison(
     of how to use ``shuffle_list``.
     """
     # read cfg file
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
 
     if windows2linux:
         warnings.warn(
@@ -1585,49 +1887,75 @@ def create_training_model_comparison(
     else:
         pass
 
+    # new shuffles are numbered after all existing ones, so none of them can overlap
     existing_shuffles = get_existing_shuffle_indices(cfg)
-    if len(existing_shuffles) == 0:
-        largestshuffleindex = 0
-    else:
-        largestshuffleindex = existing_shuffles[-1] + 1
-
-    shuffle_list = []
+    largestshuffleindex = max(existing_shuffles, default=-1) + 1
+
+    # the labeled data is loaded once, and a new split is drawn for each shuffle
+    Data = _load_labeled_data(cfg)
+    # the shuffles are numbered consecutively, in the order of the loops below
+    num_new_shuffles = num_shuffles * len(net_types) * len(augmenter_types)
+    shuffle_list = list(
+        range(largestshuffleindex, largestshuffleindex + num_new_shuffles)
+    )
+    jobs = []
     for shuffle in range(num_shuffles):
-        trainIndices, testIndices = mergeandsplit(
-            config, trainindex=trainindex, uniform=True
-        )
-        for idx_net, net in enumerate(net_types):
-            for idx_aug, aug in enumerate(augmenter_types):
-                get_max_shuffle_idx = (
-                    largestshuffleindex
-                    + idx_aug
-                    + idx_net * len(augmenter_types)
-                    + shuffle * len(augmenter_types) * len(net_types)
+        if Data is None:
+            trainIndices, testIndices = [], []
+        else:
+            trainIndices, testIndices = _split_labeled_data(
+                cfg, Data, trainindex, uniform=True
+            )
+        for net in net_types:
+            for aug in augmenter_types:
+                get_max_shuffle_idx = shuffle_list[len(jobs)]
+                jobs.append(
+                    (get_max_shuffle_idx, net, aug, shuffle, trainIndices, testIndices)
                 )
 
-                shuffle_list.append(get_max_shuffle_idx)
-                log_info = str(
-                    "Shuffle index:"
-                    + str(get_max_shuffle_idx)
-                    + ", net_type:"
-                    + net
-                    + ", augmenter_type:"
-                    + aug
-                    + ", trainsetindex:"
-                    + str(trainindex)
-                    + ", frozen shuffle ID:"
-                    + str(shuffle)
-                )
-                create_training_dataset(
-                    config,
-                    Shuffles=[get_max_shuffle_idx],
-                    net_type=net,
-                    trainIndices=[trainIndices],
-                    testIndices=[testIndices],
-                    augmenter_type=aug,
-                    userfeedback=userfeedback,
-                )
-                logger.info(log_info)
+    def create_shuffle(shuffle_idx, net, aug, shuffle, trainIndices, testIndices):
+        create_training_dataset(
+            config,
+            Shuffles=[shuffle_idx],
+            net_type=net,
+            trainIndices=(trainIndices,),
+            testIndices=(testIndices,),
+            augmenter_type=aug,
+            userfeedback=userfeedback,
+        )
+        logger.info(
+            "Shuffle index:%s, net_type:%s, augmenter_type:%s, trainsetindex:%s, "
+            "frozen shuffle ID:%s",
+            shuffle_idx,
+            net,
+            aug,
+            trainindex,
+            shuffle,
+        )
+
+    # The first shuffle of each network is created on its own, as it can download the
+    # pretrained weights. The remaining shuffles are independent, and are created
+    # concurrently unless the user has to be asked about overwriting existing models,
+    # or the annotation data can't be cached (without a merge key, each shuffle merges
+    # and writes the data again).
+    sequential = userfeedback or not _is_merge_cached(cfg)
+    concurrent_jobs = []
+    seen_nets = set()
+    for job in jobs:
+        if sequential or job[1] not in seen_nets:
+            create_shuffle(*job)
+            seen_nets.add(job[1])
+        else:
+            concurrent_jobs.append(job)
+
+    if len(concurrent_jobs) > 0:
+        max_workers = min(
+            len(concurrent_jobs), os.cpu_count() or 1, _max_concurrent_shuffles
+        )
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [executor.submit(create_shuffle, *job) for job in concurrent_jobs]
+            for future in futures:
+                future.result()
 
     return shuffle_list
 
@@ -1751,7 +2079,7 @@ def create_training_dataset_from_existing_split(
     Raises:
         ValueError: If the shuffle from which to copy the data split doesn't exist.
     """
-    cfg = auxiliaryfunctions.read_config(config)
+    cfg = auxiliaryfunctions.read_config_cached(config)
     trainset_meta_path = metadata.TrainingDatasetMetadata.path(cfg)
     if not trainset_meta_path.exists():
         meta = metadata.TrainingDatasetMetadata.create(cfg)
@@ -1759,31 +2087,36 @@ def create_training_dataset_from_existing_split(
     else:
         meta = metadata.TrainingDatasetMetadata.load(cfg, load_splits=False)
 
+    # splits are only read for the shuffle that is copied (a newly created metadata
+    # file already contains them)
     shuffle = meta.get(trainset_index=from_trainsetindex, index=from_shuffle)
-    shuffle = shuffle.load_split(cfg, trainset_path=trainset_meta_path.parent)
+    if shuffle.split is None:
+        shuffle = shuffle.load_split(cfg, trainset_path=trainset_meta_path.parent)
 
     num_copies = num_shuffles
     if shuffles is not None:
         num_copies = len(shuffles)
 
-    # pad the train and test indices with -1s so the training fraction is exact
-    train_idx = list(shuffle.split.train_indices)
-    test_idx = list(shuffle.split.test_indices)
+    # the same (read-only) arrays are used for all copies, so they're converted once
+    train_idx = np.fromiter(shuffle.split.train_indices, dtype=int)
+    test_idx = np.fromiter(shuffle.split.test_indices, dtype=int)
     n_train, n_test = len(train_idx), len(test_idx)
 
+    # pad the train and test indices with -1s so the training fraction is exact; the
+    # ratio is rounded as in create_training_dataset, which derives the fraction from it
     train_fraction = round(cfg["TrainingFraction"][from_trainsetindex], 2)
     if round(n_train / (n_train + n_test), 2) != train_fraction:
         train_padding, test_padding = _compute_padding(train_fraction, n_train, n_test)
-        train_idx = train_idx + (train_padding * [-1])
-        test_idx = test_idx + (test_padding * [-1])
+        train_idx = _expand_with_sentinel(train_idx, n_train + train_padding)
+        test_idx = _expand_with_sentinel(test_idx, n_test + test_padding)
 
     return create_training_dataset(
         config=config,
         num_shuffles=num_shuffles,
         Shuffles=shuffles,
         userfeedback=userfeedback,
-        trainIndices=[train_idx for _ in range(num_copies)],
-        testIndices=[test_idx for _ in range(num_copies)],
+        trainIndices=(train_idx,) * num_copies,
+        testIndices=(test_idx,) * num_copies,
         net_type=net_type,
         detector_type=detector_type,
         augmenter_type=augmenter_type,
@@ -1795,6 +2128,12 @@ def create_training_dataset_from_existing_split(
     )
 
 
+def _expand_with_sentinel(indices: np.ndarray, target_len: int) -> np.ndarray:
+    """Pads indices with -1s (which create_training_dataset drops) to target_len"""
+    return np.pad(indices, (0, target_len - len(indices)), constant_values=-1)
+
+
+@lru_cache(maxsize=256)
 def _compute_padding(
     train_fraction: float,
     num_train: int,
@@ -1804,6 +2143,8 @@ def _compute_padding(
     Computes the amount of padding to add to train/test indices such that
     train_fraction = num_train / (num_train + num_test).
 
+    The result only depends on the arguments, so it is cached.
+
     Returns:
         the number of padding indices to add to the train indices
         the number of padding indices to add to the test indices
@@ -1817,11 +2158,14 @@ def _compute_padding(
     base_images = 100
     train_step = int(round(round(train_fraction, 2) * base_images))
     test_step = base_images - train_step
+    if train_step == 0 or test_step == 0:
+        raise ValueError(
+            f"The training fraction must be a two digit number between 0 and 1, but "
+            f"{train_fraction} was found"
+        )
 
-    tgt_train = train_step
-    tgt_test = test_step
-    while tgt_train < num_train or tgt_test < num_test:
-        tgt_train += train_step
-        tgt_test += test_step
-
-    return (tgt_train - num_train), (tgt_test - num_test)
+    # smallest number of (train_step, test_step) blocks that hold all the indices
+    num_steps = max(
+        1, math.ceil(num_train / train_step), math.ceil(num_test / test_step)
+    )
+    return num_steps * train_step - num_train, num_steps * test_step - num_test
@@ -19,10 +19,12 @@ Licensed under GNU Lesser General Public License v3.0
 """
 from __future__ import annotations
 
+import copy
 import os
 import typing
 import pickle
 import warnings
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
@@ -241,10 +243,33 @@ def read_config(configname):
     return cfg
 
 
+def read_config_cached(configname):
+    """
+    Reads structured config file defining a project, reusing the parsed content as
+    long as the file is unchanged on disk.
+
+    The cache is keyed on the absolute path and the modification time of the file. A
+    copy of the cached config is returned, so it can safely be edited by the caller.
+    """
+    path = os.path.abspath(configname)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return read_config(configname)
+
+    return copy.deepcopy(_read_config_cached(path, mtime_ns))
+
+
+@lru_cache(maxsize=32)
+def _read_config_cached(path, mtime_ns):
+    return read_config(path)
+
+
 def write_config(configname, cfg):
     """
     Write structured config file.
     """
+    _read_config_cached.cache_clear()
     with open(configname, "w") as cf:
         cfg_file, ruamelFile = create_config_template(
             cfg.get("multianimalproject", False)
@@ -363,26 +388,24 @@ def read_plainconfig(configname):
 
 
 def write_plainconfig(configname, cfg):
+    _read_config_cached.cache_clear()
     with open(configname, "w") as file:
         YAML().dump(cfg, file)
 
 
 def attempt_to_make_folder(foldername, recursive=False):
     """Attempts to create a folder with specified name. Does nothing if it already exists."""
+    # https://github.com/DeepLabCut/DeepLabCut/issues/105 (windows)
+    foldername = os.fspath(foldername)
+    if recursive:
+        os.makedirs(foldername, exist_ok=True)
+        return
+
     try:
-        os.path.isdir(foldername)
-    except TypeError:  # https://www.python.org/dev/peps/pep-0519/
-        foldername = os.fspath(
-            foldername
-        )  # https://github.com/DeepLabCut/DeepLabCut/issues/105 (windows)
-
-    if os.path.isdir(foldername):
-        pass
-    else:
-        if recursive:
-            os.makedirs(foldername)
-        else:
-            os.mkdir(foldername)
+        os.mkdir(foldername)
+    except FileExistsError:
+        if not os.path.isdir(foldername):
+            raise
 
 
 def read_pickle(filename):
@@ -0,0 +1,139 @@
+#
+# DeepLabCut Toolbox (deeplabcut.org)
+# © A. & M.W. Mathis Labs
+# https://github.com/DeepLabCut/DeepLabCut
+#
+# Please see AUTHORS for contributors.
+# https://github.com/DeepLabCut/DeepLabCut/blob/main/AUTHORS
+#
+# Licensed under GNU Lesser General Public License v3.0
+#
+"""Tests creating shuffles concurrently in trainingsetmanipulation.py"""
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+from ruamel.yaml import YAML
+
+import deeplabcut.generate_training_dataset.trainingsetmanipulation as trainingsetmanipulation
+from deeplabcut.utils import auxiliaryfunctions
+
+
+def _make_project(root: Path, multianimal: bool, n_videos: int = 2) -> str:
+    """Creates a PyTorch project with labeled (blank) frames for each video"""
+    cfg, _ = auxiliaryfunctions.create_config_template(multianimal)
+    cfg.update(
+        {
+            "Task": "concurrent",
+            "scorer": "tester",
+            "date": "Jan1",
+            "project_path": str(root),
+            "engine": "pytorch",
+            "multianimalproject": multianimal,
+            "iteration": 0,
+            "TrainingFraction": [0.8],
+            "default_augmenter": "albumentations",
+            "video_sets": {},
+            "skeleton": [],
+        }
+    )
+    if multianimal:
+        cfg["individuals"] = ["animal0", "animal1"]
+        cfg["multianimalbodyparts"] = ["nose", "tail"]
+        cfg["uniquebodyparts"] = []
+        cfg["bodyparts"] = "MULTI!"
+        columns = pd.MultiIndex.from_product(
+            [["tester"], cfg["individuals"], ["nose", "tail"], ["x", "y"]],
+            names=["scorer", "individuals", "bodyparts", "coords"],
+        )
+    else:
+        cfg["bodyparts"] = ["nose", "tail"]
+        columns = pd.MultiIndex.from_product(
+            [["tester"], ["nose", "tail"], ["x", "y"]],
+            names=["scorer", "bodyparts", "coords"],
+        )
+
+    rng = np.random.default_rng(0)
+    for video_index in range(n_videos):
+        name = f"video{video_index}"
+        cfg["video_sets"][str(root / "videos" / f"{name}.avi")] = {
+            "crop": "0, 64, 0, 48"
+        }
+        folder = root / "labeled-data" / name
+        folder.mkdir(parents=True)
+        index = []
+        for i in range(10):
+            Image.new("RGB", (64, 48)).save(folder / f"img{i:03d}.png")
+            index.append(("labeled-data", name, f"img{i:03d}.png"))
+        data = rng.uniform(1, 40, size=(len(index), len(columns)))
+        df = pd.DataFrame(data, index=pd.MultiIndex.from_tuples(index), columns=columns)
+        df.to_hdf(folder / "CollectedData_tester.h5", key="df_with_missing", mode="w")
+
+    config = str(root / "config.yaml")
+    auxiliaryfunctions.write_config(config, cfg)
+    return config
+
+
+def _shuffles_in_metadata(config: str) -> dict:
+    cfg = auxiliaryfunctions.read_config(config)
+    trainset_folder = Path(cfg["project_path"]) / (
+        auxiliaryfunctions.get_training_set_folder(cfg)
+    )
+    with open(trainset_folder / "metadata.yaml") as f:
+        return YAML(typ="safe", pure=True).load(f)["shuffles"]
+
+
+def _splits_on_disk(config: str) -> dict:
+    cfg = auxiliaryfunctions.read_config(config)
+    trainset_folder = Path(cfg["project_path"]) / (
+        auxiliaryfunctions.get_training_set_folder(cfg)
+    )
+    splits = {}
+    for path in trainset_folder.glob("Documentation_data-*.pickle"):
+        with open(path, "rb") as f:
+            _, train_indices, test_indices, _ = pickle.load(f)
+        splits[path.name] = (list(train_indices), list(test_indices))
+    return splits
+
+
+@pytest.mark.parametrize("multianimal", [False, True])
+def test_model_comparison_records_all_shuffles(tmp_path, monkeypatch, multianimal):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    config = _make_project(tmp_path, multianimal)
+    shuffles = trainingsetmanipulation.create_training_model_comparison(
+        config,
+        num_shuffles=4,
+        net_types=["resnet_50", "resnet_101"],
+        augmenter_types=["albumentations"],
+    )
+    assert shuffles == list(range(8))
+    recorded = _shuffles_in_metadata(config)
+    assert sorted(s["index"] for s in recorded.values()) == shuffles
+
+
+def test_concurrent_splits_match_sequential(tmp_path, monkeypatch):
+    splits = []
+    for cpu_count in (1, 8):
+        monkeypatch.setattr(os, "cpu_count", lambda: cpu_count)
+        config = _make_project(tmp_path / f"cpu{cpu_count}", multianimal=False)
+        cfg = auxiliaryfunctions.read_config(config)
+        cfg["TrainingFraction"] = [0.6, 0.8]
+        auxiliaryfunctions.write_config(config, cfg)
+
+        np.random.seed(0)
+        trainingsetmanipulation.create_training_dataset(
+            config, num_shuffles=3, userfeedback=False, net_type="resnet_50"
+        )
+        splits.append((_shuffles_in_metadata(config), _splits_on_disk(config)))
+
+    (sequential_meta, sequential_splits), (concurrent_meta, concurrent_splits) = splits
+    assert len(sequential_meta) == 6
+    assert concurrent_meta == sequential_meta
+    assert len(sequential_splits) == 6
+    assert concurrent_splits == sequential_splits
@@ -11,6 +11,11 @@
 """Tests for deeplabcut/generate_training_dataset/metadata.py"""
 from __future__ import annotations
 
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
 import pytest
 
 import deeplabcut.generate_training_dataset.trainingsetmanipulation as trainingsetmanipulation
@@ -36,5 +41,172 @@ def test_compute_padding(train_fraction: int, n_train: int, n_test: int) -> None
     )
     print()
     print(train_fraction, n_train, n_test, train_pad, test_pad)
-    frac = round((n_train + train_pad)/(n_train + n_test + train_pad + test_pad), 2)
+    frac = round((n_train + train_pad) / (n_train + n_test + train_pad + test_pad), 2)
     assert train_frac == frac
+
+
+@pytest.mark.parametrize("train_fraction", [0, 0.001, 0.996, 1])
+def test_compute_padding_invalid_fraction(train_fraction: float) -> None:
+    with pytest.raises(ValueError):
+        trainingsetmanipulation._compute_padding(train_fraction, 10, 10)
+
+
+def _multianimal_annotations(seed: int = 0) -> pd.DataFrame:
+    index = pd.MultiIndex.from_tuples(
+        [("labeled-data", "vid0", f"img{i:03d}.png") for i in range(4)]
+    )
+    columns = pd.MultiIndex.from_product(
+        [["scorer"], ["animal0", "animal1", "single"], ["nose", "tail"], ["x", "y"]],
+        names=["scorer", "individuals", "bodyparts", "coords"],
+    )
+    data = np.random.default_rng(seed).random((len(index), len(columns)))
+    data[1, :4] = np.nan
+    return pd.DataFrame(data, index=index, columns=columns)
+
+
+def test_collected_data_parquet_roundtrip(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = _multianimal_annotations()
+    filename = str(tmp_path / "CollectedData_scorer")
+    trainingsetmanipulation._write_collected_data(df, filename)
+
+    assert (tmp_path / "CollectedData_scorer.parquet").exists()
+    pd.testing.assert_frame_equal(
+        trainingsetmanipulation._read_collected_data(filename), df
+    )
+
+
+def test_collected_data_ignores_stale_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    filename = str(tmp_path / "CollectedData_scorer")
+    trainingsetmanipulation._write_collected_data(_multianimal_annotations(0), filename)
+    shutil.copy2(filename + ".parquet", tmp_path / "old.parquet")
+
+    # an older parquet file restored over a new one, with a newer modification time
+    new_df = _multianimal_annotations(1)
+    trainingsetmanipulation._write_collected_data(new_df, filename)
+    shutil.copy(tmp_path / "old.parquet", filename + ".parquet")
+
+    pd.testing.assert_frame_equal(
+        trainingsetmanipulation._read_collected_data(filename), new_df
+    )
+
+
+def _single_animal_annotations(n_images: int, scorer: str = "scorer") -> pd.DataFrame:
+    index = pd.MultiIndex.from_tuples(
+        [("labeled-data", "vid0", f"img{i:03d}.png") for i in range(n_images)]
+    )
+    columns = pd.MultiIndex.from_product(
+        [[scorer], ["nose", "tail"], ["x", "y"]],
+        names=["scorer", "bodyparts", "coords"],
+    )
+    data = np.arange(n_images * len(columns), dtype=float).reshape(n_images, -1)
+    return pd.DataFrame(data, index=index, columns=columns)
+
+
+@pytest.fixture
+def merge_project(tmp_path, monkeypatch):
+    """A project with one labeled video, counting how often data is merged"""
+    cfg = {
+        "project_path": str(tmp_path),
+        "video_sets": {str(tmp_path / "videos" / "vid0.avi"): {}},
+        "scorer": "scorer",
+        "bodyparts": ["nose", "tail"],
+        "multianimalproject": False,
+        "individuals": ["animal0", "animal1"],
+        "multianimalbodyparts": ["nose", "tail"],
+        "uniquebodyparts": [],
+    }
+    labeled_folder = tmp_path / "labeled-data" / "vid0"
+    labeled_folder.mkdir(parents=True)
+    annotation_file = str(labeled_folder / "CollectedData_scorer.h5")
+    trainingsetmanipulation._write_hdf(_single_animal_annotations(3), annotation_file)
+    trainset_folder = tmp_path / "training-datasets"
+    trainset_folder.mkdir()
+
+    merges = []
+    merge = trainingsetmanipulation.merge_annotateddatasets
+
+    def counting_merge(*args):
+        merges.append(args)
+        return merge(*args)
+
+    monkeypatch.setattr(
+        trainingsetmanipulation, "merge_annotateddatasets", counting_merge
+    )
+    return cfg, annotation_file, str(trainset_folder), merges
+
+
+def test_merge_cached_hit(merge_project):
+    cfg, _, trainset_folder, merges = merge_project
+    merge_cached = trainingsetmanipulation.merge_annotateddatasets_cached
+    first = merge_cached(cfg, trainset_folder)
+    second = merge_cached(cfg, trainset_folder)
+    assert len(merges) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_merge_cached_miss_after_touch(merge_project):
+    cfg, annotation_file, trainset_folder, merges = merge_project
+    trainingsetmanipulation.merge_annotateddatasets_cached(cfg, trainset_folder)
+    stat = os.stat(annotation_file)
+    os.utime(annotation_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    trainingsetmanipulation.merge_annotateddatasets_cached(cfg, trainset_folder)
+    assert len(merges) == 2
+
+
+def test_merge_cached_miss_after_relabel_with_kept_mtime(merge_project):
+    cfg, annotation_file, trainset_folder, merges = merge_project
+    trainingsetmanipulation.merge_annotateddatasets_cached(cfg, trainset_folder)
+    stat = os.stat(annotation_file)
+    relabeled = _single_animal_annotations(5)
+    trainingsetmanipulation._write_hdf(relabeled, annotation_file)
+    os.utime(annotation_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    df = trainingsetmanipulation.merge_annotateddatasets_cached(cfg, trainset_folder)
+    assert len(merges) == 2
+    assert len(df) == len(relabeled)
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("bodyparts", ["tail", "nose"]),
+        ("scorer", "other"),
+        ("multianimalproject", True),
+        ("individuals", ["animal0"]),
+    ],
+)
+def test_merge_cached_miss_after_config_change(merge_project, key, value):
+    cfg, _, trainset_folder, merges = merge_project
+    trainingsetmanipulation.merge_annotateddatasets_cached(cfg, trainset_folder)
+    if key == "scorer":
+        # the annotation files of the new scorer must exist for a merge key
+        labeled_folder = os.path.join(cfg["project_path"], "labeled-data", "vid0")
+        trainingsetmanipulation._write_hdf(
+            _single_animal_annotations(3, scorer=value),
+            os.path.join(labeled_folder, f"CollectedData_{value}.h5"),
+        )
+    trainingsetmanipulation.merge_annotateddatasets_cached(
+        {**cfg, key: value}, trainset_folder
+    )
+    assert len(merges) == 2
+
+
+def test_merge_cached_without_key_always_merges(merge_project, monkeypatch):
+    cfg, annotation_file, trainset_folder, merges = merge_project
+    os.remove(annotation_file)
+    monkeypatch.setattr(
+        trainingsetmanipulation.conversioncode,
+        "merge_windowsannotationdataONlinuxsystem",
+        lambda cfg: [_single_animal_annotations(3)],
+    )
+    assert (
+        trainingsetmanipulation._merge_key(
+            cfg, trainingsetmanipulation._annotation_file_paths(cfg)
+        )
+        is None
+    )
+    for _ in range(2):
+        trainingsetmanipulation.merge_annotateddatasets_cached(cfg, trainset_folder)
+    assert len(merges) == 2
@@ -129,6 +129,35 @@ def test_write_config_has_skeleton(tmpdir_factory):
     assert "skeleton" in config_data
 
 
+def test_read_config_cached(tmpdir_factory):
+    project_folder = tmpdir_factory.mktemp("project")
+    fake_cfg = Path(project_folder / "config.yaml")
+    auxiliaryfunctions.write_config(fake_cfg, {"project_path": str(project_folder)})
+
+    cfg = auxiliaryfunctions.read_config_cached(fake_cfg)
+    cfg["scorer"] = "edited"
+    assert auxiliaryfunctions.read_config_cached(fake_cfg)["scorer"] != "edited"
+
+    auxiliaryfunctions.write_config(fake_cfg, cfg)
+    assert auxiliaryfunctions.read_config_cached(fake_cfg)["scorer"] == "edited"
+
+
+def test_attempt_to_make_folder(tmp_path):
+    folder = tmp_path / "a" / "b"
+    with pytest.raises(FileNotFoundError):
+        auxiliaryfunctions.attempt_to_make_folder(folder)
+
+    auxiliaryfunctions.attempt_to_make_folder(folder, recursive=True)
+    auxiliaryfunctions.attempt_to_make_folder(folder, recursive=True)
+    auxiliaryfunctions.attempt_to_make_folder(folder)
+    assert folder.is_dir()
+
+    file = tmp_path / "file"
+    file.touch()
+    with pytest.raises(FileExistsError):
+        auxiliaryfunctions.attempt_to_make_folder(file)
+
+
 @pytest.mark.parametrize(
     "multianimal, bodyparts, ma_bpts, unique_bpts, comparison_bpts, expected_bpts",
     [
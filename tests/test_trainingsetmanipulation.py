@@ -25,6 +25,7 @@ from deeplabcut.generate_training_dataset import (
     parse_video_filenames,
 )
 
+from deeplabcut.utils import auxiliaryfunctions
 from deeplabcut.utils.auxfun_videos import imread
 from deeplabcut.utils.conversioncode import guarantee_multiindex_rows
 from skimage import color, io
@@ -55,6 +56,38 @@ def test_split_trials():
         assert (len(train_inds) + len(test_inds)) == n_rows
 
 
+def test_are_files_sees_deleted_images(tmp_path):
+    (tmp_path / "subdir").mkdir()
+    paths = [str(tmp_path / name) for name in ("img0.png", "img1.png", "subdir")]
+    for path in paths[:2]:
+        open(path, "w").close()
+    missing = str(tmp_path / "missing" / "img0.png")
+
+    are_files = trainingsetmanipulation._are_files(paths + [missing])
+    assert are_files.tolist() == [True, True, False, False]
+
+    os.remove(paths[0])
+    are_files = trainingsetmanipulation._are_files(paths + [missing])
+    assert are_files.tolist() == [False, True, False, False]
+
+
+def test_adddatasetstovideolistandviceversa_removes_exact_stems(tmp_path):
+    videos_folder = tmp_path / "videos"
+    (tmp_path / "labeled-data" / "vid0").mkdir(parents=True)
+    config = str(tmp_path / "config.yaml")
+    video_sets = {
+        str(videos_folder / "vid.avi"): {"crop": "0, 640, 0, 480"},
+        str(videos_folder / "vid0.avi"): {"crop": "0, 640, 0, 480"},
+    }
+    auxiliaryfunctions.write_config(
+        config, {"project_path": str(tmp_path), "video_sets": video_sets}
+    )
+
+    trainingsetmanipulation.adddatasetstovideolistandviceversa(config)
+    cfg = auxiliaryfunctions.read_config(config)
+    assert list(cfg["video_sets"]) == [str(videos_folder / "vid0.avi")]
+
+
 def test_format_training_data(monkeypatch):
     fake_shape = 3, 480, 640
     monkeypatch.setattr(